@@ -1,3 +1,4 @@
+import pytest
 import torch
 import torchcde
 
@@ -38,3 +39,99 @@ def test_shape():
                 options['step_size'] = 1. / num_points
             out = torchcde.cdeint(spline, f, z0, out_times, method=method, options=options, rtol=1e-4, atol=1e-6)
             assert out.shape == (*batch_dims, num_out_times, num_hidden_channels)
+
+
+def test_autocast():
+    class _Func(torch.nn.Module):
+        def __init__(self):
+            super(_Func, self).__init__()
+            self.linear = torch.nn.Linear(4, 4 * 3)
+            self.dtypes = []
+
+        def forward(self, t, z):
+            out = self.linear(z)
+            # cdeint first evaluates func once, under no_grad and without autocasting, just to check shapes; skip that.
+            if torch.is_grad_enabled():
+                self.dtypes.append(out.dtype)
+            return out.view(*z.shape[:-1], 4, 3)
+
+    t = torch.linspace(0, 9, 10)
+    values = torch.rand(2, 10, 3)
+    coeffs = torchcde.natural_cubic_spline_coeffs(values, t)
+    spline = torchcde.NaturalCubicSpline(coeffs, t)
+    z0 = torch.rand(2, 4)
+
+    for adjoint in (False, True):
+        f = _Func()
+        out = torchcde.cdeint(spline, f, z0, t, adjoint=adjoint, autocast_dtype=torch.bfloat16, method='rk4',
+                              options=dict(step_size=0.5))
+        assert out.shape == (2, 10, 4)
+        assert out.dtype == torch.float32
+        num_forward_evaluations = len(f.dtypes)
+        if not adjoint:
+            assert num_forward_evaluations > 0
+        out.sum().backward()
+        assert isinstance(f.linear.weight.grad, torch.Tensor)
+        if adjoint:
+            # The adjoint forward pass runs under no_grad, but the backward pass re-evaluates the vector field with
+            # gradients enabled, and that should also be autocast.
+            assert len(f.dtypes) > num_forward_evaluations
+        assert len(f.dtypes) > 0
+        assert all(dtype == torch.bfloat16 for dtype in f.dtypes)
+
+
+class _LinearFunc(torch.nn.Module):
+    def __init__(self):
+        super(_LinearFunc, self).__init__()
+        self.linear = torch.nn.Linear(4, 4 * 3)
+
+    def forward(self, t, z):
+        return self.linear(z).view(*z.shape[:-1], 4, 3)
+
+
+@pytest.mark.skipif(not hasattr(torch, 'compile'), reason="torch.compile requires PyTorch 2.0 or later.")
+def test_compile_vector_field():
+    t = torch.linspace(0, 9, 10)
+    f = _LinearFunc()
+    z0 = torch.rand(2, 4)
+
+    for adjoint in (False, True, 'checkpoint'):
+        for autocast_dtype in (None, torch.bfloat16):
+            values = torch.rand(2, 10, 3, requires_grad=True)
+            outs = []
+            grads = []
+            for compile_vector_field in (False, True):
+                coeffs = torchcde.natural_cubic_spline_coeffs(values, t)
+                spline = torchcde.NaturalCubicSpline(coeffs, t)
+                out = torchcde.cdeint(spline, f, z0, t, adjoint=adjoint, autocast_dtype=autocast_dtype,
+                                      compile_vector_field=compile_vector_field, method='rk4',
+                                      options=dict(step_size=0.5))
+                assert out.shape == (2, 10, 4)
+                assert out.dtype == torch.float32
+                outs.append(out)
+                grads.append(torch.autograd.grad(out.sum(), (values, f.linear.weight)))
+            if autocast_dtype is None:
+                assert torch.allclose(outs[0], outs[1], atol=1e-5)
+                for grad, grad_compiled in zip(*grads):
+                    assert torch.allclose(grad, grad_compiled, atol=1e-4)
+
+
+# Before PyTorch 2.5, Dynamo specialises on the particular X and func passed, so this only holds from 2.5 onwards.
+@pytest.mark.skipif(not hasattr(torch, 'compile') or
+                    tuple(int(v) for v in torch.__version__.split('.')[:2]) < (2, 5),
+                    reason="Requires PyTorch 2.5 or later.")
+def test_compile_vector_field_no_recompile():
+    torch._dynamo.reset()
+    torch._dynamo.utils.counters.clear()
+
+    t = torch.linspace(0, 9, 10)
+    f = _LinearFunc()
+    z0 = torch.rand(2, 4)
+    for _ in range(3):
+        # A new spline of the same shape every time, as when training on a new batch of data each step.
+        values = torch.rand(2, 10, 3)
+        coeffs = torchcde.natural_cubic_spline_coeffs(values, t)
+        spline = torchcde.NaturalCubicSpline(coeffs, t)
+        torchcde.cdeint(spline, f, z0, t, adjoint=False, compile_vector_field=True, method='rk4',
+                        options=dict(step_size=0.5))
+    assert torch._dynamo.utils.counters['stats']['unique_graphs'] == 1
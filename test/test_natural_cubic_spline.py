@@ -195,3 +195,21 @@ def test_specification_and_derivative():
                     autoderivative = torch.stack(autoderivative).view(*evaluate.shape)
                     assert derivative.shape == autoderivative.shape
                     assert derivative.allclose(autoderivative, atol=1e-5, rtol=1e-5)
+
+
+def test_load_old_state_dict():
+    t = torch.linspace(0, 9, 10)
+    x = torch.rand(2, 10, 3)
+    coeffs = torchcde.natural_cubic_spline_coeffs(x, t)
+    spline = torchcde.NaturalCubicSpline(coeffs, t)
+
+    # State dicts used to hold the coefficients as separate buffers
+    a, b, two_c, three_d = spline._coeffs.unbind(dim=-2)
+    old_state_dict = {'_t': t, '_a': a, '_b': b, '_two_c': two_c, '_three_d': three_d}
+
+    new_spline = torchcde.NaturalCubicSpline(torch.zeros_like(coeffs), t)
+    new_spline.load_state_dict(old_state_dict)
+    assert (new_spline._coeffs == spline._coeffs).all()
+    point = torch.tensor(4.5)
+    assert torch.allclose(new_spline.derivative(point), spline.derivative(point))
+    assert torch.allclose(new_spline.evaluate(point), spline.evaluate(point))
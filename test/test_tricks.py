@@ -1,4 +1,5 @@
 import functools as ft
+import numpy as np
 import pytest
 import torch
 import torchcde
@@ -43,7 +44,7 @@ class _Func(torch.nn.Module):
 # Test that gradients can propagate through the controlling path at all
 def test_grad_paths():
     for method in ('rk4', 'dopri5'):
-        for adjoint in (True, False):
+        for adjoint in (True, False, 'checkpoint'):
             t = torch.linspace(0, 9, 10, requires_grad=True)
             path = torch.rand(1, 10, 3, requires_grad=True)
             coeffs = torchcde.natural_cubic_spline_coeffs(path, t)
@@ -117,6 +118,68 @@ def test_stacked_paths():
                 assert isinstance(first_path.grad, torch.Tensor)
 
 
+# Test that values which merely compare equal to True still collect the computed parameters of X for the adjoint
+def test_adjoint_truthy():
+    for adjoint in (1, np.bool_(True)):
+        path = torch.rand(1, 10, 3, requires_grad=True)
+        coeffs = torchcde.natural_cubic_spline_coeffs(path)
+        cubic_spline = torchcde.NaturalCubicSpline(coeffs)
+        z0 = torch.rand(1, 3)
+        func = _Func(input_size=3, hidden_size=3)
+        t_ = torch.tensor([0., 9.])
+
+        z = torchcde.cdeint(X=cubic_spline, func=func, z0=z0, t=t_, adjoint=adjoint, method='rk4',
+                            options=dict(step_size=0.5))
+        z[:, -1].sum().backward()
+        assert isinstance(path.grad, torch.Tensor)
+        assert (path.grad != 0).any()
+
+
+# Test that adjoint=True still works when nothing requires gradients, including with adjoint-specific kwargs
+def test_adjoint_no_grad():
+    path = torch.rand(1, 10, 3)
+    coeffs = torchcde.natural_cubic_spline_coeffs(path)
+    cubic_spline = torchcde.NaturalCubicSpline(coeffs)
+    z0 = torch.rand(1, 3)
+    func = _Func(input_size=3, hidden_size=3)
+    t_ = torch.tensor([0., 9.])
+
+    adjoint_kwargs = dict(adjoint_method='rk4', adjoint_options=dict(step_size=0.5), adjoint_rtol=1e-4,
+                          adjoint_atol=1e-6, adjoint_params=tuple(func.parameters()))
+    outs = []
+    for extra_kwargs in ({}, adjoint_kwargs):
+        with torch.no_grad():
+            z = torchcde.cdeint(X=cubic_spline, func=func, z0=z0, t=t_, adjoint=True, method='rk4',
+                                options=dict(step_size=0.5), **extra_kwargs)
+        assert z.shape == (1, 2, 3)
+        assert not z.requires_grad
+        outs.append(z)
+    assert (outs[0] == outs[1]).all()
+
+
+# Test that checkpointing gives the same results and gradients as backpropagating through the solver directly
+def test_checkpoint():
+    path = torch.rand(1, 10, 3, requires_grad=True)
+    coeffs = torchcde.natural_cubic_spline_coeffs(path)
+    cubic_spline = torchcde.NaturalCubicSpline(coeffs)
+    z0 = torch.rand(1, 3, requires_grad=True)
+    func = _Func(input_size=3, hidden_size=3)
+    t_ = torch.linspace(0, 9, 10)
+
+    outs = []
+    grads = []
+    for adjoint in (False, 'checkpoint'):
+        z = torchcde.cdeint(X=cubic_spline, func=func, z0=z0, t=t_, adjoint=adjoint, method='rk4',
+                            options=dict(step_size=0.5))
+        assert z.shape == (1, 10, 3)
+        outs.append(z)
+        grads.append(torch.autograd.grad(z.sum(), (path, z0, func.variable)))
+
+    assert torch.allclose(outs[0], outs[1])
+    for grad, grad_checkpoint in zip(*grads):
+        assert torch.allclose(grad, grad_checkpoint)
+
+
 # Tests that the trick in which we use detaches in the backward pass if possible, does in fact work
 # It's a bit superfluous to test it here now that we've upstreamed it into torchdiffeq, but oh well
 def test_detach_trick():
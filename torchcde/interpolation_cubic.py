@@ -235,15 +235,21 @@ class NaturalCubicSpline(torch.nn.Module):
         channels = coeffs.size(-1) // 4
         if channels * 4 != coeffs.size(-1):  # check that it's a multiple of 4
             raise ValueError("Passed invalid coeffs.")
-        a, b, two_c, three_d = (coeffs[..., :channels], coeffs[..., channels:2 * channels],
-                                coeffs[..., 2 * channels:3 * channels], coeffs[..., 3 * channels:])
+        # Store a, b, two_c, three_d in a single tensor of shape (..., length - 1, 4, channels), so that looking up the
+        # coefficients of a piece is a single gather rather than one per coefficient.
+        # (As we're typically computing derivatives, we store the multiples of c and d that are more useful.)
+        coeffs = coeffs.reshape(*coeffs.shape[:-1], 4, channels)
 
         misc.register_computed_parameter(self, '_t', t)
-        misc.register_computed_parameter(self, '_a', a)
-        misc.register_computed_parameter(self, '_b', b)
-        # as we're typically computing derivatives, we store the multiples of these coefficients that are more useful
-        misc.register_computed_parameter(self, '_two_c', two_c)
-        misc.register_computed_parameter(self, '_three_d', three_d)
+        misc.register_computed_parameter(self, '_coeffs', coeffs)
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # Splines used to store a, b, two_c, three_d as separate buffers. Convert state dicts saved with those into the
+        # single _coeffs buffer used now, so that old saved models can still be loaded.
+        old_keys = [prefix + name for name in ('_a', '_b', '_two_c', '_three_d')]
+        if prefix + '_coeffs' not in state_dict and all(key in state_dict for key in old_keys):
+            state_dict[prefix + '_coeffs'] = torch.stack([state_dict.pop(key) for key in old_keys], dim=-2)
+        super(NaturalCubicSpline, self)._load_from_state_dict(state_dict, prefix, *args, **kwargs)
 
     @property
     def grid_points(self):
@@ -254,8 +260,8 @@ class NaturalCubicSpline(torch.nn.Module):
         return torch.stack([self._t[0], self._t[-1]])
 
     def _interpret_t(self, t):
-        t = torch.as_tensor(t, dtype=self._b.dtype,  device=self._b.device)
-        maxlen = self._b.size(-2) - 1
+        t = torch.as_tensor(t, dtype=self._coeffs.dtype,  device=self._coeffs.device)
+        maxlen = self._coeffs.size(-3) - 1
         # clamp because t may go outside of [t[0], t[-1]]; this is fine
         index = torch.bucketize(t.detach(), self._t.detach()).sub(1).clamp(0, maxlen)
         # will never access the last element of self._t; this is correct behaviour
@@ -265,13 +271,15 @@ class NaturalCubicSpline(torch.nn.Module):
     def evaluate(self, t):
         fractional_part, index = self._interpret_t(t)
         fractional_part = fractional_part.unsqueeze(-1)
-        inner = 0.5 * self._two_c[..., index, :] + self._three_d[..., index, :] * fractional_part / 3
-        inner = self._b[..., index, :] + inner * fractional_part
-        return self._a[..., index, :] + inner * fractional_part
+        a, b, two_c, three_d = self._coeffs[..., index, :, :].unbind(dim=-2)
+        inner = 0.5 * two_c + three_d * fractional_part / 3
+        inner = b + inner * fractional_part
+        return a + inner * fractional_part
 
     def derivative(self, t):
         fractional_part, index = self._interpret_t(t)
         fractional_part = fractional_part.unsqueeze(-1)
-        inner = self._two_c[..., index, :] + self._three_d[..., index, :] * fractional_part
-        deriv = self._b[..., index, :] + inner * fractional_part
+        b, two_c, three_d = self._coeffs[..., index, 1:, :].unbind(dim=-2)
+        inner = two_c + three_d * fractional_part
+        deriv = b + inner * fractional_part
         return deriv
@@ -1,4 +1,7 @@
+import inspect
+import math
 import torch
+import torch.utils.checkpoint
 import torchdiffeq
 
 
@@ -49,12 +52,16 @@ class _VectorField(torch.nn.Module):
 
         self.X = X
         self.func = func
+        # Looking up submodules goes through torch.nn.Module.__getattr__, which is slow, so we store the bound methods
+        # that we call on every evaluation as plain attributes.
+        self._derivative = X.derivative
+        self._func_call = func.__call__
 
     def __call__(self, t, z):
         # control_gradient is of shape (..., input_channels)
-        control_gradient = self.X.derivative(t)
+        control_gradient = self._derivative(t)
         # vector_field is of shape (..., hidden_channels, input_channels)
-        vector_field = self.func(t, z)
+        vector_field = self._func_call(t, z)
         # out is of shape (..., hidden_channels)
         # (The squeezing is necessary to make the matrix-multiply properly batch in all cases)
         out = (vector_field @ control_gradient.unsqueeze(-1)).squeeze(-1)
@@ -62,7 +69,47 @@ class _VectorField(torch.nn.Module):
         return out
 
 
-def cdeint(X, func, z0, t, adjoint=True, **kwargs):
+class _AutocastVectorField(_VectorField):
+    def __init__(self, X, func, autocast_dtype):
+        """Defines a controlled vector field, evaluated under autocasting.
+
+        Arguments:
+            X: As cdeint.
+            func: As cdeint.
+            autocast_dtype: As cdeint.
+        """
+        super(_AutocastVectorField, self).__init__(X=X, func=func)
+        self.autocast_dtype = autocast_dtype
+
+    def __call__(self, t, z):
+        with torch.autocast(z.device.type, dtype=self.autocast_dtype):
+            out = super(_AutocastVectorField, self).__call__(t, z)
+        # Keep the solver state (and so its step size control) in the precision of z
+        return out.to(z.dtype)
+
+
+def _checkpointed_odeint(func, y0, t, **kwargs):
+    # Splits t into roughly sqrt(len(t)) segments. Only the solution at the boundaries between segments is stored during
+    # the forward pass; everything inside a segment is recomputed during the backward pass.
+    num_intervals = t.size(0) - 1
+    if num_intervals == 0:
+        return y0.unsqueeze(0)
+    num_segments = max(1, int(math.sqrt(t.size(0))))
+    segment_length = -(-num_intervals // num_segments)  # ceiling division
+
+    def _odeint(y0_, t_):
+        return torchdiffeq.odeint(func=func, y0=y0_, t=t_, **kwargs)
+
+    out = [y0.unsqueeze(0)]
+    for start in range(0, num_intervals, segment_length):
+        t_segment = t[start:start + segment_length + 1]
+        out_segment = torch.utils.checkpoint.checkpoint(_odeint, y0, t_segment, use_reentrant=False)
+        out.append(out_segment[1:])
+        y0 = out_segment[-1]
+    return torch.cat(out, dim=0)
+
+
+def cdeint(X, func, z0, t, adjoint=True, autocast_dtype=None, compile_vector_field=False, **kwargs):
     r"""Solves a system of controlled differential equations.
 
     Solves the controlled problem:
@@ -86,7 +133,24 @@ def cdeint(X, func, z0, t, adjoint=True, **kwargs):
             of batch dimensions.
         t: a one dimensional tensor describing the times to range of times to integrate over and output the results at.
             The initial time will be t[0] and the final time will be t[-1].
-        adjoint: A boolean; whether to use the adjoint method to backpropagate. Defaults to True.
+        adjoint: Either True, False or 'checkpoint'; how to backpropagate. True uses the adjoint method. False
+            backpropagates through the internal operations of the solver. 'checkpoint' also backpropagates through the
+            solver, but splits t into roughly sqrt(len(t)) segments and recomputes each segment during the backward
+            pass, trading extra computation for reduced memory. (This requires PyTorch 1.11 or later.) Note that each
+            segment is solved separately, so adaptive step size selection restarts at the start of every segment,
+            and a fixed step size grid is restarted from the start of every segment. As such this will in general
+            give a slightly different solution to adjoint=False. Defaults to True.
+        autocast_dtype: Optional lower precision dtype, for example `torch.bfloat16`. If passed then X.derivative, func,
+            and their product are evaluated under `torch.autocast` with this dtype, whilst the solution itself is kept
+            in the dtype of z0. (This requires PyTorch 1.10 or later.) Defaults to None, meaning no autocasting.
+        compile_vector_field: A boolean; whether to compile the evaluation of the vector field (X.derivative, func,
+            and their product) with `torch.compile`. This is most worthwhile when repeatedly solving with the same
+            shapes, for example during training; changing shapes triggers recompilation. Anything that cannot be
+            compiled falls back to normal Python execution. (This requires PyTorch 2.0 or later.) On PyTorch versions
+            before 2.5 the compiled code is specialised to the particular X and func, so passing a new X on every call
+            (e.g. a new spline for every batch of data) recompiles on every call, and once
+            `torch._dynamo.config.cache_size_limit` is reached silently falls back to normal Python execution.
+            Defaults to False.
         **kwargs: Any additional kwargs to pass to the odeint solver of torchdiffeq (the most common are `rtol`, `atol`,
             `method`, `options`).
 
@@ -95,7 +159,8 @@ def cdeint(X, func, z0, t, adjoint=True, **kwargs):
         This will be a tensor of shape (..., len(t), hidden_channels).
 
     Raises:
-        ValueError for malformed inputs.
+        ValueError for malformed inputs. (Checking the shapes of X and func requires evaluating them once, so this is
+        skipped when running Python with the -O flag.)
 
     Warnings:
         Note that the returned tensor puts the sequence dimension second-to-last, rather than first like in
@@ -116,9 +181,25 @@ def cdeint(X, func, z0, t, adjoint=True, **kwargs):
     if 'rtol' not in kwargs:
         kwargs['rtol'] = 1e-4
 
-    _check_compatability(X, func, z0, t)
-
-    if adjoint:
+    if isinstance(adjoint, str):
+        if adjoint != 'checkpoint':
+            raise ValueError("adjoint must be one of True, False or 'checkpoint'.")
+        if 'use_reentrant' not in inspect.signature(torch.utils.checkpoint.checkpoint).parameters:
+            raise ValueError("adjoint='checkpoint' requires PyTorch 1.11 or later.")
+    else:
+        # Normalise e.g. 1 or numpy.bool_(True), so that the checks below behave consistently.
+        adjoint = bool(adjoint)
+    if autocast_dtype is not None and not hasattr(torch, 'autocast'):
+        raise ValueError("autocast_dtype requires PyTorch 1.10 or later.")
+    if compile_vector_field and not hasattr(torch, 'compile'):
+        raise ValueError("compile_vector_field=True requires PyTorch 2.0 or later.")
+
+    if __debug__:
+        # These evaluations are only used to check shapes, so don't record them in the autograd graph.
+        with torch.no_grad():
+            _check_compatability(X, func, z0, t)
+
+    if adjoint and adjoint != 'checkpoint':
         try:
             adjoint_params = tuple(kwargs['adjoint_params'])
         except KeyError:
@@ -133,10 +214,32 @@ def cdeint(X, func, z0, t, adjoint=True, **kwargs):
         except AttributeError:
             computed_params = ()
         adjoint_params = tuple(param for param in adjoint_params + computed_params if param.requires_grad)
-        kwargs['adjoint_params'] = adjoint_params
-
-    vector_field = _VectorField(X=X, func=func)
-    odeint = torchdiffeq.odeint_adjoint if adjoint else torchdiffeq.odeint
+        if torch.is_grad_enabled() and (len(adjoint_params) > 0 or z0.requires_grad or t.requires_grad):
+            kwargs['adjoint_params'] = adjoint_params
+        else:
+            # Nothing to backpropagate to (e.g. during evaluation), so skip the overhead of the adjoint machinery.
+            # torchdiffeq.odeint doesn't accept any of the adjoint-specific arguments (adjoint_params, adjoint_rtol,
+            # adjoint_atol, adjoint_method, adjoint_options, ...), so drop them.
+            kwargs = {key: value for key, value in kwargs.items() if not key.startswith('adjoint_')}
+            adjoint = False
+
+    # Decide once here whether to autocast, rather than branching on every evaluation of the vector field.
+    if autocast_dtype is None:
+        vector_field = _VectorField(X=X, func=func)
+    else:
+        vector_field = _AutocastVectorField(X=X, func=func, autocast_dtype=autocast_dtype)
+    if compile_vector_field:
+        # The default mode rather than 'reduce-overhead': the latter uses CUDA graphs, which reuse their output memory
+        # between calls, whilst the solver holds on to the outputs of several stages at once.
+        # (Adjoint parameters have already been collected explicitly above, so it doesn't matter that the result of
+        # compiling isn't a torch.nn.Module.)
+        vector_field = torch.compile(vector_field.__call__, dynamic=False)
+    if adjoint == 'checkpoint':
+        odeint = _checkpointed_odeint
+    elif adjoint:
+        odeint = torchdiffeq.odeint_adjoint
+    else:
+        odeint = torchdiffeq.odeint
     out = odeint(func=vector_field, y0=z0, t=t, **kwargs)
 
     batch_dims = range(1, len(out.shape) - 1)